@@ -4,13 +4,15 @@ Main app class used to instantiate application as a whole.
 
 from typing import List
 import os
-import argparse
+import sys
 
 import tkinter as tk
 from tkinter import filedialog
 from tkinter import messagebox
 
 from diffcrawler.widgets.main_window import MainWindow
+from diffcrawler.widgets.text_window import TextWindow
+from diffcrawler.utils.requester import DEFAULT_MAX_WORKERS
 
 
 class DiffCrawler(tk.Tk):
@@ -37,25 +39,45 @@ class DiffCrawler(tk.Tk):
 
         # Keep list of created main windows
         self._main_windows: List[MainWindow] = []
+        # Closed (hidden) text windows, reused to show further texts instead of creating new windows
+        self._hidden_text_windows: List[TextWindow] = []
+
+        # Parse command-line arguments before creating windows (settings apply to all windows)
+        self._parse_args()
         
         self.new_window()
 
         # Must be called after main window is created, otherwise menu of main window overwrites this
         self.createcommand('tk::mac::Quit', self.exit)
 
-        # Check if files were given via command line
-        self._parse_args()
+        # Open files given via command line
+        if self.file_paths:
+            self.open_file(paths=self.file_paths)
     
     def _parse_args(self) -> None:
-        """Parse command-line arguments (paths to files to be opened)."""
-        parser = argparse.ArgumentParser(
-            prog='python -m diffcrawler',
-            description='GUI tool to monitor website changes',
-            )
-        parser.add_argument('file_paths', type=str, nargs='*', help='Paths to DiffCrawler file(s) to open')
-        self.args = parser.parse_args()
-        if self.args.file_paths:
-            self.open_file(paths=self.args.file_paths)
+        """Parse command-line arguments (paths to files to be opened and settings)."""
+        self.file_paths = sys.argv[1:]
+        # Number of concurrent fetches (threads and kept-alive connections) per window
+        self.max_workers = DEFAULT_MAX_WORKERS
+
+        # Apart from file paths, only options are accepted, so argparse is only imported and set up if options
+        # (e.g. '--help') were passed. Plain paths are used directly.
+        if any(arg.startswith('-') for arg in self.file_paths):
+            import argparse
+
+            parser = argparse.ArgumentParser(
+                prog='python -m diffcrawler',
+                description='GUI tool to monitor website changes',
+                )
+            parser.add_argument('file_paths', type=str, nargs='*', help='Paths to DiffCrawler file(s) to open')
+            parser.add_argument('-w', '--max-workers', type=int, default=DEFAULT_MAX_WORKERS,
+                                help=f'Maximum number of websites fetched simultaneously per window (default: {DEFAULT_MAX_WORKERS}). '
+                                     'Values above ~50 bring little gain and risk rate limits by servers.')
+            args = parser.parse_args()
+            if args.max_workers < 1:
+                parser.error('argument -w/--max-workers: must be at least 1')
+            self.file_paths = args.file_paths
+            self.max_workers = args.max_workers
 
     def create_main_window(self, path: str) -> None:
         """Instantiate new main window and append it to main window list"""
@@ -125,6 +147,16 @@ class DiffCrawler(tk.Tk):
         """Create empty window."""
         self.create_main_window(path='')
 
+    def show_text(self, text: str, title: str = '') -> None:
+        """Show a text in a text window, reusing a hidden one if available."""
+        if self._hidden_text_windows:
+            wdw = self._hidden_text_windows.pop()
+            wdw.set_text(text, title=title)
+            wdw.deiconify()
+            wdw.lift()
+        else:
+            TextWindow(self, text, title=title, on_close=self._hidden_text_windows.append)
+
     def main_window_destroyed(self, main_window: MainWindow) -> None:
         """Register that a main window was destroyed, remove it from list and exit if it was the last window."""
         self._main_windows.remove(main_window)
@@ -4,28 +4,31 @@ Central controller object responsible for all data-related tasks.
 
 from __future__ import annotations
 from typing import List
+from typing import Tuple
 from typing import TYPE_CHECKING
-import shutil
+import concurrent.futures
+import functools
 import os
-import webbrowser
 
 from sqlalchemy import create_engine, select, text
 from sqlalchemy.orm import Session
+from sqlalchemy.orm import selectinload
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.sql.expression import func
 from sqlalchemy import event
 
 from diffcrawler.utils.dbscheme import Base, Resource, Revision
 from diffcrawler.utils.requester import Requester
+from diffcrawler.utils.requester import DEFAULT_MAX_WORKERS
 from diffcrawler.utils.misc import IncorrectFileFormatError
 from diffcrawler.utils.misc import is_valid_url
+from diffcrawler.utils.misc import calc_changes
 
 if TYPE_CHECKING:
     from diffcrawler.widgets.main_window import MainWindow
 from diffcrawler.widgets.list_pane import ListPane
 from diffcrawler.widgets.property_pane import PropertyPane
 from diffcrawler.widgets.action_pane import ActionPane
-from diffcrawler.widgets.text_window import TextWindow
 
 class DataController:
     """
@@ -35,7 +38,8 @@ class DataController:
     There is one data controller per file/main window.
     """
 
-    def __init__(self, path: str, main_wdw: MainWindow, list_pane: ListPane, property_pane: PropertyPane, action_pane: ActionPane) -> None:
+    def __init__(self, path: str, main_wdw: MainWindow, list_pane: ListPane, property_pane: PropertyPane, action_pane: ActionPane,
+                 max_workers: int = DEFAULT_MAX_WORKERS) -> None:
         
         self._main_wdw = main_wdw
         self.list_pane = list_pane
@@ -45,7 +49,7 @@ class DataController:
         # Register this controller in the corresponding UI widgets so that they can communicate with it
         self.list_pane.controller = self
         self.property_pane.controller = self
-        self.action_pane.controller = self
+        self.action_pane.set_controller(self)
 
         
         self._selected_resources = []
@@ -62,13 +66,20 @@ class DataController:
             self.session.commit()
         # Load saved resources
         else:
-            stmt = select(Resource).order_by(Resource.order)
+            # Load the revisions of all resources with one additional query (the list shows their fetch dates),
+            # but not their sources, which are only needed once diffs are calculated
+            stmt = (select(Resource)
+                    .options(selectinload(Resource.revisions).defer(Revision.src))
+                    .order_by(Resource.order))
             res_from_file = list(self.session.scalars(stmt))
-            for res in res_from_file:
-                self.list_pane.insert_resource(res)
+            self.list_pane.insert_resources(res_from_file)
         
         # Instantiate requester object
-        self.requester = Requester(max_workers=5)
+        self.requester = Requester(after=self._main_wdw.after, max_workers=max_workers)
+        # Single thread used to calculate diffs of fetched resources, so that they don't block fetching or the UI
+        self._diff_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Set once the controller is closed, results of fetches and diffs finishing afterwards are dropped
+        self._closed = False
 
     @property
     def path(self) -> str:
@@ -95,19 +106,7 @@ class DataController:
             if not is_valid_url(url):
                 return
 
-        # If there is a selection of resources, insert the new one right below the selection.
-        # Otherwise at end of list.        
-        max_order_val = self.session.query(func.max(Resource.order)).scalar()
-        if self._selected_resources:
-            new_order_val = self._selected_resources[-1].order + 1
-            self.session.query(Resource).where(Resource.order >= new_order_val).update({Resource.order: Resource.order + 1})
-        elif max_order_val is not None:
-            new_order_val = max_order_val + 1
-        # First item in list (list was empty)
-        else:
-            new_order_val = 0
-
-        new_res = Resource(order=new_order_val, url=url) 
+        new_res = Resource(order=self._make_room(1), url=url) 
         self.session.add(new_res)
         self.session.flush()
 
@@ -118,13 +117,60 @@ class DataController:
         if not url:
             self.property_pane.focus_url_field()
 
+    def new_resources(self, urls: List[str]) -> None:
+        """Create new resources for a list of URLs at once (invalid URLs are skipped) and append them to the DB and the resources list."""
+        urls = [url for url in urls if is_valid_url(url)]
+        if not urls:
+            return
+
+        # One renumbering and one flush for all new resources instead of one per URL
+        first_order_val = self._make_room(len(urls))
+        new_res_list = [Resource(order=first_order_val + i, url=url) for i, url in enumerate(urls)]
+        self.session.add_all(new_res_list)
+        self.session.flush()
+
+        for new_res in new_res_list:
+            self.list_pane.insert_resource(new_res)
+        self.list_pane.select_resources(new_res_list)
+
+    def _make_room(self, count: int) -> int:
+        """Free 'count' consecutive order positions for new resources and return the first of them."""
+        # If there is a selection of resources, insert the new ones right below the selection.
+        # Otherwise at end of list.        
+        if self._selected_resources:
+            new_order_val = self._selected_resources[-1].order + 1
+            self.session.query(Resource).where(Resource.order >= new_order_val).update({Resource.order: Resource.order + count})
+            return new_order_val
+
+        max_order_val = self.session.query(func.max(Resource.order)).scalar()
+        if max_order_val is not None:
+            return max_order_val + 1
+        # First item in list (list was empty)
+        else:
+            return 0
+
     def remove_resource(self) -> None:
         """Remove a resource from DB and list."""
+        if not self._selected_resources:
+            return
+
+        # Selected resources are sorted by order, nothing above the first of them needs renumbering
+        first_removed_order = self._selected_resources[0].order
+
         for resource in self._selected_resources:
-            self.session.query(Resource).where(Resource.order > resource.order).update({Resource.order: Resource.order - 1})
             self.session.delete(resource)
-            self.session.flush()
+        self.session.flush()
 
+        # Close the gaps in the order: the remaining resources below the first removed one are renumbered
+        # consecutively. The new values are calculated here, so the flush sends them as one batch of UPDATEs
+        # by primary key (its size does not depend on the number of removed resources).
+        stmt = select(Resource).where(Resource.order > first_removed_order).order_by(Resource.order)
+        for new_order_val, resource in enumerate(self.session.scalars(stmt), start=first_removed_order):
+            resource.order = new_order_val
+        self.session.flush()
+
+        # Update list only once the DB is up to date
+        for resource in self._selected_resources:
             self.list_pane.remove_resource(resource)
     
     def property_changed(self, property: str, new_value: str | int | bool) -> None:
@@ -152,8 +198,8 @@ class DataController:
         fetch_list = []
 
         for resource in self._selected_resources:
-            # Exclude empty URLs
-            if resource.url == '':
+            # Exclude empty URLs (new resources have none until one is entered)
+            if not resource.url:
                 continue
             url_dict = {
                 'id': resource.id_,
@@ -168,46 +214,102 @@ class DataController:
         # Hand list of to-be-fetched URLs to the requester
         self.requester.fetch_concurrently(fetch_list, self.fetch_done)
     
-    def fetch_done(self, id_: int, success: bool, content: str | None) -> None:
-        """Callback for requester to be notified when fetching has been donde for a resource (URL)"""
-
-        # Get resource correspondig to ID
-        stmt = select(Resource).where(Resource.id_ == id_)
-        resource = self.session.scalars(stmt).one()
+    def fetch_done(self, results: List[Tuple[int, bool, str | None]]) -> None:
+        """Callback for requester to be notified when fetching has been donde for a batch of resources (URLs)"""
+        # The window (and its list) may be gone already
+        if self._closed:
+            return
+
+        resources = []
+        # Pairs of (new, previous) revisions to be diffed
+        diffs: List[Tuple[Revision, Revision]] = []
+        for id_, success, content in results:
+            resource = self._apply_fetch(id_, success, content, diffs)
+            if resource is not None:
+                resources.append(resource)
+
+        # Update DB and list once for the whole batch
+        self.session.flush()
+        self.list_pane.update_resources(resources)
+
+        # Parsing and diffing large pages is slow, so the diff lines are calculated in the diff thread. It is only
+        # handed the sources (no DB access outside of this thread), the result is applied in 'diff_done'. Revisions
+        # are passed on by ID (assigned by the flush above), as "Save as" may replace the session in the meantime.
+        for new_rev, prev_rev in diffs:
+            future = self._diff_executor.submit(calc_changes, new_rev.src, prev_rev.src)
+            future.add_done_callback(functools.partial(self._on_diff_done, new_rev.resource_id,
+                                                       (new_rev.id_, prev_rev.id_)))
+
+    def _apply_fetch(self, id_: int, success: bool, content: str | None, diffs: List[Tuple[Revision, Revision]]) -> Resource | None:
+        """
+        Apply the result of fetching a resource and return it (None if resource has been removed in the meantime).
+        If the new revision needs to be diffed, it is added to 'diffs' together with the previous revision.
+        """
+        # Get resource correspondig to ID (usually from the identity map, without emitting SQL)
+        resource = self.session.get(Resource, id_)
+        if resource is None:
+            return None
         # Set that process has finished
         resource.in_process = False
         
         # Fetching was successful and there is source code in the payload
         if success and content is not None:
             resource.fetch_successful = True
+            # Not flushed here, 'fetch_done' flushes the whole batch (the ID of the new revision is not needed before)
             new_rev = Revision(resource=resource, src=content)
             self.session.add(new_rev)
-            self.session.flush()
 
-            # Remove oldest revision if there are more than 3 (only 3 are kept)
-            sorted_revs = sorted(resource.revisions)
-            if len(resource.revisions) > 3:
-                resource.revisions.remove(sorted_revs[0])
+            # Remove oldest revisions if there are more than 3 (only 3 are kept, revisions are ordered oldest first)
+            del resource.revisions[:-3]
                 
-            # Calculate diff lines for resource
-            resource.update_diff_lines()
-
-            # Set resource to unread if more lines changed than defined in threshold
-            if resource.diff_lines >= resource.diff_thresh:
-                resource.is_unread = True
+            prev_rev = resource.prev_revision
+            if prev_rev and new_rev.src != prev_rev.src:
+                diffs.append((new_rev, prev_rev))
+            # Nothing to compare with yet (first revision) or source unchanged, so there are no changed lines
+            else:
+                resource.diff_lines = 0
             
         # In case of network error (probably DNS error or timeout)
         else:
             resource.fetch_successful = False
 
+        return resource
+    
+    def _on_diff_done(self, id_: int, revision_ids: Tuple[int, int], future: concurrent.futures.Future) -> None:
+        """Hand the result of a finished diff calculation over to the Tk event loop (runs in the diff thread)."""
+        # Diffs cancelled on close have no result, and diffs finishing after close must not touch the (possibly
+        # destroyed) window
+        if future.cancelled() or self._closed:
+            return
+        self._main_wdw.after(0, self.diff_done, id_, revision_ids, future.result())
+
+    def diff_done(self, id_: int, revision_ids: Tuple[int, int], result: Tuple[list, list, int]) -> None:
+        """Callback for the diff thread to be notified when the diff lines of a fetched resource have been calculated."""
+        # The window (and its list) may be gone already
+        if self._closed:
+            return
+
+        resource = self.session.get(Resource, id_)
+        # Resource might have been removed in the meantime
+        if resource is None:
+            return
+
+        # Outdated result (resource fetched again or fetch undone while diffing), nothing to update
+        if not resource.apply_diff(*revision_ids, *result):
+            return
+
+        # Set resource to unread if more lines changed than defined in threshold
+        if resource.diff_lines >= resource.diff_thresh:
+            resource.is_unread = True
+
         self.session.flush()
         self.list_pane.update_resource(resource)
-    
+
     def undo_fetch(self) -> None:
         """Revert last fetch (useful if new fetch contains a maintenance message, for example)."""
         for resource in self._selected_resources:
             if resource.cur_revision:
-                resource.revisions.remove(resource.cur_revision)
+                resource.remove_revision(resource.cur_revision)
                 resource.update_diff_lines()
                 self.session.flush()
                 self.list_pane.update_resource(resource)
@@ -218,10 +320,13 @@ class DataController:
         for resource in self._selected_resources:
             diff = resource.get_diff()
             if diff:
-                TextWindow(self._main_wdw, diff, title=resource.url)
+                self._main_wdw.parent.show_text(diff, title=resource.url)
 
     def open_url(self) -> None:
         """Open URLs of selected resources in new browser tabs and mark resources as read."""
+        # Imported on first use (pulls in subprocess and friends, not needed at startup)
+        import webbrowser
+
         for resource in self._selected_resources:
             if resource.url:
                 webbrowser.open(resource.url, new=2)
@@ -237,6 +342,15 @@ class DataController:
             self.list_pane.update_resource(resource)
         
 
+    def close(self) -> None:
+        """Release the resources used for fetching, diffing and the DB (called when the main window is destroyed or gets another file)."""
+        self._closed = True
+        self.requester.close()
+        self._diff_executor.shutdown(wait=False, cancel_futures=True)
+        # Release the session's connection (open file handle or memory DB)
+        self.session.close()
+        self.session.get_bind().dispose()
+
     def save_as(self, path: str) -> None:
         """Save open file (or memory DB) to a new file and change path to that new file."""
         # No "Save as" if paths are equal
@@ -247,6 +361,8 @@ class DataController:
         # Commiting to the DB overwrites old file, but "Save as" needs to preserve old file
         # and write into new file. So old file is copied to temp file before committing:
         if not self.is_memory_db:
+            import shutil
+
             oldpath = self.path
             tempfile = self.path + '-tmp'
             shutil.copy2(oldpath, tempfile)
@@ -268,7 +384,10 @@ class DataController:
         else:
             self.session.execute(text('VACUUM main INTO :path'), {'path': path})
 
-        # Replace session with new session for new path
+        # Release the old session's connection (open file handle or memory DB), then replace session with
+        # new session for new path
+        self.session.close()
+        self.session.get_bind().dispose()
         self.session = self._setup_session(path)
 
         # Move tempfile back to old location
@@ -296,9 +415,9 @@ class DataController:
         """Return of the open window is just 'saved' in a memory DB"""
         return True if self.path == ':memory:' else False
     
-    def selected_urls(self) -> str:
-        """Return a comma-separated string of the URLs of the selected resources."""
-        return ','.join([res.url for res in self._selected_resources])
+    def selected_urls(self) -> List[str]:
+        """Return a list of the URLs of the selected resources (resources without URL are left out)."""
+        return [res.url for res in self._selected_resources if res.url]
     
     def _check_file_format(self, path: str):
         """Check if the file format is correct and if not, raise exception."""
@@ -308,17 +427,22 @@ class DataController:
             
     def _setup_session(self, path: str) -> Session:
         """Setup everything needed for the SQLite session and start it."""
-        # Thread checking needs to be switched off because after fetching, session is accessed from worker
-        # threads (not from main thread). Using StaticPool (one global connection) should solve problem
-        # of possible data corruption in case of concurrent connections.        
+        # Finished fetches and diffs are handed back to the Tk event loop, so the session is only used from the
+        # main thread. Thread checking stays switched off and StaticPool (one global connection) is kept as a
+        # safeguard against data corruption in case of concurrent connections.        
         engine = create_engine(f'sqlite:///{path}',
                                connect_args={'check_same_thread': False},
                                poolclass=StaticPool)
 
         session = Session(engine)
 
-        # Keep the rollback journal in memory only (avoids writing '-journal' files to disk)
+        # Keep the rollback journal in memory only (avoids writing '-journal' files to disk).
+        # WAL mode is not an option: its '-wal' file would hold committed data that "Save as" (which
+        # copies/moves the main file) does not take along.
         session.execute(text('PRAGMA journal_mode = MEMORY'))
+        # Keep temporary tables/indices in memory and allow a larger page cache (negative value: size in KiB)
+        session.execute(text('PRAGMA temp_store = MEMORY'))
+        session.execute(text('PRAGMA cache_size = -20000'))
 
         # No commits are pending when session is 'fresh'
         session.info['commit_pending'] = False
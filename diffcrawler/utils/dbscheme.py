@@ -21,6 +21,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
 
 from diffcrawler.utils.misc import SiteDiff
+from diffcrawler.utils.misc import parse_html
 
 
 class Base(DeclarativeBase):
@@ -35,7 +36,7 @@ class Resource(Base):
 
     id_ = mapped_column(Integer, primary_key=True)
     # Order of the resources in list (for display purposes)
-    order = mapped_column(Integer)
+    order = mapped_column(Integer, index=True)
     url = mapped_column(String(2000), default=None)
     # Marked as favorite or not
     is_fav = mapped_column(Boolean, nullable=False, default=False)
@@ -50,62 +51,99 @@ class Resource(Base):
     fetch_successful = mapped_column(Boolean, default=None)
     # Number of changed lines (diff) between last two revisions
     diff_lines = mapped_column(Integer, default=None)
-    # Revisions (retrieved sources) associated with this resource
-    revisions = relationship('Revision', back_populates='resource')
+    # Revisions (retrieved sources) associated with this resource, oldest first.
+    # Revisions removed from this list are deleted from the DB (instead of being kept without resource).
+    revisions = relationship('Revision', back_populates='resource', order_by='Revision.fetch_date',
+                             cascade='all, delete-orphan')
 
 
     # Fetch is currently in process? (not a mapped value!)
     in_process = False
+    # Calculated diff lines per pair of revision IDs (current, previous) (not a mapped value!)
+    _diff_lines_cache = None
 
     @property
     def cur_date(self) -> datetime.datetime | None:
         """Return fetch date of newest revision"""
-        if len(self.revisions) >= 1:
-            return (sorted(self.revisions)[-1].fetch_date)
-        else:
-            return None
+        cur_revision = self.cur_revision
+        return cur_revision.fetch_date if cur_revision else None
 
     @property
     def prev_date(self) -> datetime.datetime | None:
         """Return fetch date of previous revision"""
-        if len(self.revisions) >= 2:
-            return (sorted(self.revisions)[-2].fetch_date)
-        else:
-            return None
+        prev_revision = self.prev_revision
+        return prev_revision.fetch_date if prev_revision else None
         
     @property
     def cur_revision(self) -> Revision | None:
         """Return newest revision"""
-        sorted_revs = sorted(self.revisions)
-
+        # Revisions are kept ordered by fetch date (see relationship above), no sorting needed
         if len(self.revisions) >= 1:
-            return sorted_revs[-1]
+            return self.revisions[-1]
         else:
             return None
         
     @property
     def prev_revision(self) -> Revision | None:
         """Return previous revision"""
-        sorted_revs = sorted(self.revisions)
-
         if len(self.revisions) >= 2:
-            return sorted_revs[-2]
+            return self.revisions[-2]
         else:
             return None
     
     def update_diff_lines(self):
         """Calculate and update the diff lines using the two most recent revisions."""
-        if self.cur_revision and self.prev_revision:
-            diff = SiteDiff(self.cur_revision.src, self.prev_revision.src)
-            self.diff_lines = diff.num_changes()
+        cur_revision = self.cur_revision
+        prev_revision = self.prev_revision
+
+        if cur_revision and prev_revision:
+            if self._diff_lines_cache is None:
+                self._diff_lines_cache = {}
+            # Only diff if this pair of revisions has not been diffed before (e.g. before an undone fetch)
+            key = (cur_revision.id_, prev_revision.id_)
+            if key not in self._diff_lines_cache:
+                # Identical sources can't differ, no need to parse and diff them
+                if cur_revision.src == prev_revision.src:
+                    self._diff_lines_cache[key] = 0
+                else:
+                    diff = SiteDiff(cur_revision.stripped(), prev_revision.stripped())
+                    self._diff_lines_cache[key] = diff.num_changes()
+            self.diff_lines = self._diff_lines_cache[key]
         # Set diff to zero if there aren't at least two revisions available
         else:
             self.diff_lines = 0
 
+    def apply_diff(self, cur_revision_id: int, prev_revision_id: int, cur_stripped: list, prev_stripped: list, diff_lines: int) -> bool:
+        """
+        Update the diff lines with a diff calculated elsewhere (e.g. in another thread) and keep its results cached.
+        Return if the diff was applied: results are dropped if the two revisions are no longer the two most recent ones
+        (a newer fetch or an undone fetch takes care of the diff lines then).
+        """
+        cur_revision = self.cur_revision
+        prev_revision = self.prev_revision
+        if not (cur_revision and prev_revision and cur_revision.id_ == cur_revision_id and prev_revision.id_ == prev_revision_id):
+            return False
+
+        cur_revision._stripped_cache = cur_stripped
+        prev_revision._stripped_cache = prev_stripped
+        if self._diff_lines_cache is None:
+            self._diff_lines_cache = {}
+        self._diff_lines_cache[(cur_revision_id, prev_revision_id)] = diff_lines
+        self.diff_lines = diff_lines
+
+        return True
+
+    def remove_revision(self, revision: Revision) -> None:
+        """Remove a revision and forget the cached diff lines it was part of."""
+        # SQLite may reuse the ID of the newest row once it is deleted, so cached results must not outlive it
+        if self._diff_lines_cache:
+            self._diff_lines_cache = {key: lines for key, lines in self._diff_lines_cache.items() if revision.id_ not in key}
+        self.revisions.remove(revision)
+
     def get_diff(self):
         """Calculate and return the diff between the two most recent revisions."""
         if self.cur_revision and self.prev_revision:
-            diff = SiteDiff(self.cur_revision.src, self.prev_revision.src)
+            diff = SiteDiff(self.cur_revision.stripped(), self.prev_revision.stripped())
             return diff.diff()
         # Return none of there aren't at least two revisions available
         else:
@@ -121,17 +159,19 @@ class Revision(Base):
 
     id_ = mapped_column(Integer, primary_key=True)
     # Resource ID to which this revision corresponds
-    resource_id = mapped_column(ForeignKey('resource.id_'))
+    resource_id = mapped_column(ForeignKey('resource.id_'), index=True)
     # Resource object to which this revision belongs
     resource = relationship('Resource', back_populates='revisions')
-    fetch_date = mapped_column(DateTime, default=datetime.datetime.now)
+    fetch_date = mapped_column(DateTime, default=datetime.datetime.now, index=True)
     # Retrieved website source
     src = mapped_column(UnicodeText, nullable=False, default='')
 
-    # Allow comparing revisions by date
-    def __lt__(self, other: Revision) -> bool:
-        return (self.fetch_date < other.fetch_date)
-    
-    def __gt__(self, other: Revision) -> bool:
-        return (self.fetch_date > other.fetch_date)
+    # Cached text elements of the source (not a mapped value!)
+    _stripped_cache = None
+
+    def stripped(self) -> List[str]:
+        """Return the individual text elements of the source, parsing the HTML only on first access."""
+        if self._stripped_cache is None:
+            self._stripped_cache = parse_html(self.src)
+        return self._stripped_cache
 
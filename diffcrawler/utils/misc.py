@@ -2,29 +2,127 @@
 Miscellaneous utility functions and classes.
 """
 
+from __future__ import annotations
+
 import datetime
+import functools
+import io
 import re
-import difflib
+import sys
+from typing import Tuple
+from urllib.parse import urlsplit
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tkinter as tk
+
 
-from bs4 import BeautifulSoup
+# URL schemes accepted by 'is_valid_url'
+_URL_SCHEMES = {'http', 'https', 'ftp', 'ftps'}
+# Host part of a URL: domain name with at least one dot (labels as in the Django URL regex), localhost or IPv4.
+# Labels can't contain dots, so matching is linear (no catastrophic backtracking on long junk input).
+_HOST_RE = re.compile(
+    r'^(?:(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9-]{2,}\.?'
+    r'|localhost'
+    r'|\d{1,3}(?:\.\d{1,3}){3})$', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s')
 
 
 def format_date(date: datetime.datetime) -> str:
     """Return a formatted date string."""
     return f'{date :%d %b %Y, %H:%M}'
 
+@functools.lru_cache(maxsize=256)
 def is_valid_url(url: str) -> bool:
     """Check if the passed URL is of a valid URL format."""
-    # Regex from Django, not perfect for edge cases, but probably good for most uses
-    regex = re.compile(
-    r'^(?:http|ftp)s?://' # http:// or https://
-    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'
-    r'localhost|'
-    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})' # ...or ip
-    r'(?::\d+)?'
-    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    
-    return re.match(regex, url) is not None
+    if _WHITESPACE_RE.search(url):
+        return False
+
+    try:
+        parts = urlsplit(url)
+        # Raises ValueError for a non-numeric or out-of-range port
+        parts.port
+    except ValueError:
+        return False
+
+    return parts.scheme in _URL_SCHEMES and _HOST_RE.match(parts.hostname or '') is not None
+
+def parse_html(src: str) -> list:
+    """Parse the HTML source and return a list of the individual text elements."""
+    collector = _TextCollector()
+    collector.feed(src)
+    collector.close()
+    return collector.strings
+
+class _TextCollector(HTMLParser):
+    """
+    Streaming HTML parser collecting the stripped text elements of a source (same elements as BeautifulSoup's
+    'stripped_strings', but without building a tree of tag objects that would be discarded right away).
+    """
+
+    # Tags whose content is not displayed text
+    _SKIPPED_TAGS = {'script', 'style', 'template'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.strings = []
+        # Text fragments of the current text element. The parser may hand over one element in several pieces
+        # (e.g. split at a stray '<'), so like BeautifulSoup, they are only joined at the next tag, comment etc.
+        self._fragments = []
+        # Depth of nested skipped tags at the current position
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        self._end_string()
+        if tag in self._SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        self._end_string()
+        if tag in self._SKIPPED_TAGS and self._skip_depth > 0:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._fragments.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._end_string()
+
+    def handle_decl(self, decl: str) -> None:
+        self._end_string()
+
+    def handle_pi(self, data: str) -> None:
+        self._end_string()
+
+    def unknown_decl(self, data: str) -> None:
+        self._end_string()
+        # CDATA sections are text elements of their own
+        if data.upper().startswith('CDATA['):
+            self.handle_data(data[len('CDATA['):])
+            self._end_string()
+
+    def close(self) -> None:
+        super().close()
+        self._end_string()
+
+    def _end_string(self) -> None:
+        """Add the text element collected so far to the strings (unless it is empty after stripping)."""
+        if not self._fragments:
+            return
+        string = ''.join(self._fragments).strip()
+        self._fragments.clear()
+        if string:
+            # Intern the strings: text repeated within and across revisions (menus, boilerplate) is stored only once
+            # and compares by identity when diffing
+            self.strings.append(sys.intern(string))
+
+def calc_changes(src1: str, src2: str) -> Tuple[list, list, int]:
+    """Parse both HTML sources and return their text elements and the number of changes between them."""
+    stripped1 = parse_html(src1)
+    stripped2 = parse_html(src2)
+    return (stripped1, stripped2, SiteDiff(stripped1, stripped2).num_changes())
 
 class SiteDiff():
     """
@@ -32,35 +130,34 @@ class SiteDiff():
     the number of changes between them.
     """
 
-    def __init__(self, src1: str, src2: str):
-        self._src1 = src1
-        self._src2 = src2
-
-        # Get stripped version of sources (list of individual text elements in each source)
-        self._stripped1 = self._parse_html(src1)
-        self._stripped2 = self._parse_html(src2)
-
-    def _parse_html(self, src: str) -> list:
-        """Parse the HTML source and return a list of the individual text elements."""
-        soup = BeautifulSoup(src, 'html.parser')
-        return list(soup.stripped_strings)
+    def __init__(self, stripped1: list, stripped2: list):
+        # Stripped versions of the sources (list of individual text elements in each source, see 'parse_html').
+        # Parsing is left to the caller so that the (expensive) result can be cached per revision.
+        self._stripped1 = stripped1
+        self._stripped2 = stripped2
     
     def diff(self) -> str:
         """Return the diff of the stripped versions of the two sources."""
+        # Imported on first use (not needed at startup)
+        import difflib
+
         site1 = [string + '\n' for string in self._stripped1]
         site2 = [string + '\n' for string in self._stripped2]
 
-        diff = ''.join(difflib.ndiff(site1, site2))
+        # Write the diff lines into a buffer as they are generated instead of collecting them all for a join
+        diff = io.StringIO()
+        diff.writelines(difflib.ndiff(site1, site2))
 
-        return diff
+        return diff.getvalue()
     
     def num_changes(self) -> int:
         """Calculate and return the number of changes between the sources (what's new in src1)"""
-        changes = 0
-        
-        for line in self.diff().splitlines():
-            if line.startswith('- '):
-                changes += 1
+        # Only the count is needed here, so skip 'ndiff' (and its slow intraline hints) and count the
+        # elements of src1 which are replaced or deleted directly from the matcher's opcodes
+        import difflib
+
+        matcher = difflib.SequenceMatcher(None, self._stripped1, self._stripped2, autojunk=False)
+        changes = sum(i2 - i1 for tag, i1, i2, _, _ in matcher.get_opcodes() if tag in ('replace', 'delete'))
         
         return changes
     
@@ -78,12 +175,19 @@ class ShortcutFormatter:
     and bind keys (keyboard shortcuts).
     """
 
+    # Formatter shared by all widgets of the app (see 'for_widget')
+    _shared: ShortcutFormatter | None = None
+
     def __init__(self, ws: str):
         # Windowing System: 'aqua', 'win32' or 'x11'
         self.ws = ws
 
-        # On Mac, 'Command' is roughly equivalent to 'Ctrl' on X11 and Windows
-        self.equiv_ctrl = ['Ctrl', 'Command', 'Control']
+    @classmethod
+    def for_widget(cls, widget: tk.Misc) -> ShortcutFormatter:
+        """Return the formatter for the windowing system of the widget (queried from Tk only once, it never changes)."""
+        if cls._shared is None:
+            cls._shared = cls(ws=widget.tk.call('tk', 'windowingsystem'))
+        return cls._shared
 
     def accel(self, key: str, mod1: str, mod2: str = '') -> str:
         """Format and return platform-specific accelerator string"""
@@ -99,20 +203,32 @@ class ShortcutFormatter:
 
     def _key_sequence(self, join_symb: str, key: str, mod1: str, mod2: str = '') -> str:
         """Create platform-specific key sequence string with custom join symbol between keys."""
+        return _key_sequence(self.ws, join_symb, key, mod1, mod2)
+
 
-        sequence = ''
+# On Mac, 'Command' is roughly equivalent to 'Ctrl' on X11 and Windows
+_EQUIV_CTRL = ('Ctrl', 'Command', 'Control')
+
+@functools.lru_cache(maxsize=128)
+def _key_sequence(ws: str, join_symb: str, key: str, mod1: str, mod2: str = '') -> str:
+    """
+    Create platform-specific key sequence string with custom join symbol between keys.
+    Cached, as every window formats the same small set of shortcuts.
+    """
 
-        if mod1 in self.equiv_ctrl:
-            sequence += 'Command' if self.ws == 'aqua' else 'Control'
+    sequence = ''
+
+    if mod1 in _EQUIV_CTRL:
+        sequence += 'Command' if ws == 'aqua' else 'Control'
+    else:
+        sequence += mod1
+    
+    if mod2:
+        if mod2 in _EQUIV_CTRL:
+            sequence += join_symb + 'Command' if ws == 'aqua' else join_symb + 'Control'
         else:
-            sequence += mod1
-        
-        if mod2:
-            if mod2 in self.equiv_ctrl:
-                sequence += join_symb + 'Command' if self.ws == 'aqua' else join_symb + 'Control'
-            else:
-                sequence += join_symb + mod1
-        
-        sequence += join_symb + key
+            sequence += join_symb + mod1
+    
+    sequence += join_symb + key
 
-        return sequence
+    return sequence
\ No newline at end of file
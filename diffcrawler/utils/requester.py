@@ -3,39 +3,131 @@ Requester, used to fetch URLs (website sources) concurrently (using threads).
 """
 
 import concurrent.futures
+import collections
+import functools
+import threading
 
 import requests
-from typing import Tuple, List, Callable
+import requests.adapters
+from requests.compat import chardet
+from typing import Tuple, List, Dict, Callable
+
+
+# Default number of workers (concurrent connections/threads)
+DEFAULT_MAX_WORKERS = 5
+# Maximum size of a fetched website source in bytes (larger ones are treated as failed fetch)
+MAX_CONTENT_SIZE = 8 * 1024 * 1024
+# Size of the chunks in which the response body is read
+CHUNK_SIZE = 64 * 1024
 
 
 class Requester():
     """
     Requester class. Uses threads to fetch a list of urls concurrently and calls a callback once finished.
+    Callbacks are called from the Tk event loop, once for all fetches finishing close together.
     """
-    def __init__(self, max_workers=5):
-        # Use a thread pool executor with a default of 5 workers (concurrent connections/threads)
+    def __init__(self, after: Callable, max_workers: int = DEFAULT_MAX_WORKERS):
+        # Use a thread pool executor with one worker per concurrent connection
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
 
+        # Tk 'after' method (of any widget), used to hand finished fetches over to the Tk event loop
+        self._after = after
+        # Finished fetches waiting to be passed on to their callbacks, and whether a drain is already scheduled
+        self._results = collections.deque()
+        self._results_lock = threading.Lock()
+        self._drain_scheduled = False
+        self._closed = False
+
+        # Persistent session, so that connections (TCP/TLS) are kept alive and reused for subsequent fetches
+        # of the same host. Pool size matches the number of workers: a smaller pool would make workers wait for
+        # connections, a larger one is never used.
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
     def fetch_url(self, url: str, timeout: int) -> Tuple[bool, str | None]:
         """Fetch and return the source of the passed url."""
         try:
-            response = requests.get(url, timeout=timeout)
+            # Stream the body, so that oversized responses can be aborted before they are loaded completely
+            with self.session.get(url, timeout=timeout, stream=True) as response:
+                # Check if response code is 'ok'
+                if response.status_code != 200:
+                    return (False, None)
+
+                # Reject responses announcing a too large body right away
+                if int(response.headers.get('Content-Length', 0) or 0) > MAX_CONTENT_SIZE:
+                    return (False, None)
+
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > MAX_CONTENT_SIZE:
+                        return (False, None)
+                    chunks.append(chunk)
         # An error occurred (most likely timeout error):
-        except requests.exceptions.RequestException:
-            return(False, None)
-        else:
-            # Check if response code is 'ok'
-            if response.status_code == 200:
-                return (True, response.text)
-            else:
-                return (False, None)
+        except (requests.exceptions.RequestException, ValueError):
+            return (False, None)
+
+        content = b''.join(chunks)
+        # Same encoding detection as 'response.text': declared encoding or, if missing, guessed from the content
+        encoding = response.encoding or chardet.detect(content)['encoding'] or 'utf-8'
+        try:
+            return (True, content.decode(encoding, errors='replace'))
+        # Unknown encoding declared by server
+        except LookupError:
+            return (True, content.decode('utf-8', errors='replace'))
+
+    def close(self) -> None:
+        """Stop pending fetches and close all kept-alive connections."""
+        self._closed = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
 
     def fetch_concurrently(self, urls: List[dict], callback: Callable) -> None:
-        """Fetch list of urls concurrently and call the passed callback function for each of them when finished."""
+        """
+        Fetch list of urls concurrently. The passed callback function is called with a list of (id, success, content)
+        tuples of the fetches finished since its last call.
+        """
         for url_dict in urls:
             future = self.executor.submit(self.fetch_url, url_dict['url'], url_dict['timeout'])
-            # Use of default arguments necessary here because lambdas are produced in a for loop!
-            future.add_done_callback(lambda _, url_dict=url_dict, future=future: 
-                                     callback(url_dict['id'], future.result()[0], future.result()[1]))
+            # Partial binds the current url_dict (callbacks are produced in a for loop!)
+            future.add_done_callback(functools.partial(self._on_done, url_dict, callback))
+
+    def _on_done(self, url_dict: dict, callback: Callable, future: concurrent.futures.Future) -> None:
+        """Queue the result of a finished fetch and make sure a drain is scheduled in the Tk event loop."""
+        # Fetches cancelled on close have no result (and the Tk widgets may be gone already)
+        if future.cancelled() or self._closed:
+            return
+        success, content = future.result()
+
+        with self._results_lock:
+            self._results.append((callback, url_dict['id'], success, content))
+            # Only the first fetch of a burst schedules a drain, the following ones are picked up by it
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+
+        self._after(20, self._drain)
+
+    def _drain(self) -> None:
+        """Pass all queued results on to their callbacks, one call per callback (runs in the Tk event loop)."""
+        with self._results_lock:
+            results = list(self._results)
+            self._results.clear()
+            self._drain_scheduled = False
+
+        # Drain scheduled before close, the callbacks' widgets may be gone already
+        if self._closed:
+            return
+
+        batches: Dict[Callable, List[Tuple[int, bool, str | None]]] = {}
+        for callback, id_, success, content in results:
+            batches.setdefault(callback, []).append((id_, success, content))
+
+        for callback, batch in batches.items():
+            callback(batch)
+
 
             
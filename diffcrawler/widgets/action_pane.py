@@ -2,8 +2,14 @@
 Action widget.
 """
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 import tkinter.ttk as ttk
 
+if TYPE_CHECKING:
+    from diffcrawler.utils.data_controller import DataController
+
 
 class ActionPane(ttk.Frame):
     """
@@ -18,15 +24,24 @@ class ActionPane(ttk.Frame):
         self.columnconfigure(0, weight=1)
         self.rowconfigure(2, weight=1)
 
-        self.fetch_btn = ttk.Button(self, text='Fetch', command=lambda: self.controller.fetch())
+        self.fetch_btn = ttk.Button(self, text='Fetch')
         self.fetch_btn.grid(column=0, row=0, sticky='we')
 
-        self.open_btn = ttk.Button(self, text='Open URL', command=lambda: self.controller.open_url())
+        self.open_btn = ttk.Button(self, text='Open URL')
         self.open_btn.grid(column=0, row=1, sticky='we')
         
 
-        self.add_btn = ttk.Button(self, text='Add', command=lambda: self.controller.new_resource())
+        self.add_btn = ttk.Button(self, text='Add')
         self.add_btn.grid(column=0, row=3, sticky='we')
 
-        self.remove_btn = ttk.Button(self, text='Remove', command=lambda: self.controller.remove_resource())
-        self.remove_btn.grid(column=0, row=4, sticky='we')
\ No newline at end of file
+        self.remove_btn = ttk.Button(self, text='Remove')
+        self.remove_btn.grid(column=0, row=4, sticky='we')
+
+    def set_controller(self, controller: DataController) -> None:
+        """Register the data controller and connect the buttons directly to its methods."""
+        self.controller = controller
+
+        self.fetch_btn.configure(command=controller.fetch)
+        self.open_btn.configure(command=controller.open_url)
+        self.add_btn.configure(command=controller.new_resource)
+        self.remove_btn.configure(command=controller.remove_resource)
\ No newline at end of file
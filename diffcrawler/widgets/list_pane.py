@@ -4,6 +4,7 @@ List widget holding the resources (website list).
 
 from typing import Tuple
 from typing import List
+from typing import Dict
 
 import tkinter.ttk as ttk
 
@@ -12,6 +13,14 @@ from diffcrawler.utils.misc import format_date
 from diffcrawler.utils.misc import ShortcutFormatter
 
 
+# Characters shown in the unread, favorite and status columns
+_DOT = '\N{black circle}'
+_STAR = '\N{black star}'
+_ELLIPSIS = '\N{midline horizontal ellipsis}'
+_CHECK = '\N{heavy check mark}'
+_XMARK = '\N{heavy ballot x}'
+
+
 class ListPane(ttk.Frame):
     """
     Main and central UI widget holding the list of resources (websites).
@@ -24,6 +33,9 @@ class ListPane(ttk.Frame):
 
         # Column names and UI text, in order from left to right
         self._cols = {
+            # Unread items are marked in this column rather than in bold font (a font change per item makes
+            # Tk re-measure the row, which adds up when many items change during fetches)
+            'is_unread': 'Unread',
             'is_fav': 'Fav',
             'url': 'URL',
             'timeout': 'Timeout',
@@ -35,6 +47,9 @@ class ListPane(ttk.Frame):
 
         }
 
+        # Formatted column values per resource ID, together with the raw values they were formatted from
+        self._values_cache: Dict[int, Tuple[tuple, list]] = {}
+
         self.columnconfigure(0, weight=1, minsize=100)
         self.columnconfigure(1, weight=1, minsize=100)
         self.columnconfigure(2, weight=0, minsize=0)
@@ -50,6 +65,7 @@ class ListPane(ttk.Frame):
             self.list_box.heading(col, text=text)
 
         # Adjust sizes
+        self.list_box.column('is_unread', width=60, minwidth=60, stretch=False, anchor='center')
         self.list_box.column('is_fav', width=40, minwidth=40, stretch=False)
         self.list_box.column('timeout', width=80, minwidth=60, stretch=False)
         self.list_box.column('diff_lines', width=60, minwidth=60, stretch=False)
@@ -58,7 +74,7 @@ class ListPane(ttk.Frame):
         self.list_box.column('diff_thresh', width=80, minwidth=60, stretch=False)
         self.list_box.column('prev_date', width=160, minwidth=160, stretch=False)
 
-        sf = ShortcutFormatter(ws=self.tk.call('tk', 'windowingsystem'))
+        sf = ShortcutFormatter.for_widget(self)
 
         # Inform data controller of changed selection
         self.list_box.bind('<<TreeviewSelect>>', self._selection_changed)
@@ -68,51 +84,69 @@ class ListPane(ttk.Frame):
 
         self.list_box.grid(row=0, column=0, columnspan=2, sticky='nsew')
 
-        # Items with tag 'unread' are shown in bold font
-        self.list_box.tag_configure('unread', font=('', 0, 'bold'))
-
     def insert_resource(self, resource: Resource) -> None:
         """Insert a resource into list at its order position."""
-        self.list_box.insert('', resource.order, values=self._values_for_cols(resource), iid=resource.id_, tags=self._tags(resource))
+        self.list_box.insert('', resource.order, values=self._values_for_cols(resource), iid=resource.id_)
     
+    def insert_resources(self, resources: List[Resource]) -> None:
+        """Append a list of resources (sorted by order) to the end of the list."""
+        for resource in resources:
+            self.list_box.insert('', 'end', values=self._values_for_cols(resource), iid=resource.id_)
+
     def update_resource(self, resource: Resource) -> None:
         """Update an existing resource."""
-        self.list_box.item(resource.id_, values=self._values_for_cols(resource), tags=self._tags(resource))
+        self.list_box.item(resource.id_, values=self._values_for_cols(resource))
         
+    def update_resources(self, resources: List[Resource]) -> None:
+        """Update a list of existing resources."""
+        # Tk redraws the list once when idle, not after every single item change, so no need to detach the items
+        for resource in resources:
+            self.list_box.item(resource.id_, values=self._values_for_cols(resource))
+
     def remove_resource(self, resource: Resource) -> None:
         """"Delete the resource from the list."""
         self.list_box.delete(resource.id_)
+        self._values_cache.pop(resource.id_, None)
         
     def _values_for_cols(self, resource: Resource) -> list:
         """Format the properties of the passed resource for display in the columns and return the list of formatted values."""        
         # For each column, read out corresponding attribute from resource, default is empty string
-        values = {col: getattr(resource, col, '') for col in self._cols}
-
-        for date in ['cur_date', 'prev_date']:
-            values[date] = format_date(values[date]) if values[date] else ''
-
-        # Change 'None' attributes to empty string, otherwise 'None' is shown in widget
-        values = {col: value if value is not None else '' for col, value in values.items()}
-
-        # Format boolean favorite value to unicode star character if True
-        values['is_fav'] = '\N{black star}' if values['is_fav'] else ''
-        
-        if resource.in_process:
-            values['status'] = '\N{midline horizontal ellipsis}'
-        elif resource.fetch_successful:
-            values['status'] = '\N{heavy check mark}'
-        elif resource.fetch_successful is False: # 'None' is also falsy so we need to check with 'is' here!
-            values['status'] = '\N{heavy ballot x}'
-        else: # Here we catch the 'None' case, which is falsy but means "no fetch recorded" and not a failed fetch
-            values['status'] = ''
-        
-        return list(values.values())
+        raw_values = tuple(getattr(resource, col, '') for col in self._cols)
+
+        # Reuse formatted values if nothing shown in the row has changed since the last call
+        cache_key = (*raw_values, resource.in_process, resource.fetch_successful)
+        cached = self._values_cache.get(resource.id_)
+        if cached and cached[0] == cache_key:
+            return cached[1]
+
+        # Format all values in a single pass, in column order
+        formatted_values = []
+        for col, value in zip(self._cols, raw_values):
+            if col == 'is_unread':
+                value = _DOT if value else ''
+            elif col == 'is_fav':
+                # Format boolean favorite value to unicode star character if True
+                value = _STAR if value else ''
+            elif col == 'cur_date' or col == 'prev_date':
+                value = format_date(value) if value else ''
+            elif col == 'status':
+                if resource.in_process:
+                    value = _ELLIPSIS
+                elif resource.fetch_successful:
+                    value = _CHECK
+                elif resource.fetch_successful is False: # 'None' is also falsy so we need to check with 'is' here!
+                    value = _XMARK
+                else: # Here we catch the 'None' case, which is falsy but means "no fetch recorded" and not a failed fetch
+                    value = ''
+            # Change 'None' attributes to empty string, otherwise 'None' is shown in widget
+            elif value is None:
+                value = ''
+            formatted_values.append(value)
+
+        self._values_cache[resource.id_] = (cache_key, formatted_values)
+
+        return formatted_values
     
-    def _tags(self, resource: Resource) -> Tuple[str|None]:
-        """Return tags for resource (currently only 'unread' available)."""
-        tags = ('unread') if resource.is_unread else tuple()
-        return tags
-
     def _selection_changed(self, _) -> None:
         """Inform controller of the selection change."""
         self.controller.selection_changed(list(self.list_box.selection()))
@@ -120,6 +154,10 @@ class ListPane(ttk.Frame):
     def select_resource(self, resource: Resource) -> None:
         """Change selection to a certain resource."""
         self.list_box.selection_set(resource.id_)
+
+    def select_resources(self, resources: List[Resource]) -> None:
+        """Change selection to a list of resources."""
+        self.list_box.selection_set([resource.id_ for resource in resources])
     
     def _select_all(self, _) -> None:
         """Select all resources in list."""
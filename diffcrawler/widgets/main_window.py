@@ -73,7 +73,7 @@ class MainWindow(tk.Toplevel):
 
         ## Create menus
 
-        sf = ShortcutFormatter(ws=self.tk.call('tk', 'windowingsystem'))
+        sf = ShortcutFormatter.for_widget(self)
 
         self.option_add('*tearOff', False)
         self.menubar = tk.Menu(self)
@@ -92,23 +92,23 @@ class MainWindow(tk.Toplevel):
 
         # Edit menu
         self.menu_edit = tk.Menu(self.menubar)
-        self.menu_edit.add_command(label='Undo Fetch', command=self.controller.undo_fetch, accelerator=sf.accel(key='Z', mod1='Command'))
+        self.menu_edit.add_command(label='Undo Fetch', command=lambda: self.controller.undo_fetch(), accelerator=sf.accel(key='Z', mod1='Command'))
         self.menu_edit.add_separator()
         self.menu_edit.add_command(label='Copy', command=lambda: self.focus_get().event_generate('<<Copy>>'), accelerator=sf.accel(key='C', mod1='Command'))
         self.menu_edit.add_command(label='Paste', command=lambda: self.focus_get().event_generate('<<Paste>>'), accelerator=sf.accel(key='V', mod1='Command'))
         self.menu_edit.add_separator()
-        self.menu_edit.add_command(label='Fetch', command=self.controller.fetch, accelerator=sf.accel(key='G', mod1='Command'))
+        self.menu_edit.add_command(label='Fetch', command=lambda: self.controller.fetch(), accelerator=sf.accel(key='G', mod1='Command'))
         self.menu_edit.add_separator()
-        self.menu_edit.add_command(label='Add', command=self.controller.new_resource, accelerator=sf.accel(key='N', mod1='Command'))
-        self.menu_edit.add_command(label='Remove', command=self.controller.remove_resource, accelerator=sf.accel(key='Backspace', mod1='Command'))
+        self.menu_edit.add_command(label='Add', command=lambda: self.controller.new_resource(), accelerator=sf.accel(key='N', mod1='Command'))
+        self.menu_edit.add_command(label='Remove', command=lambda: self.controller.remove_resource(), accelerator=sf.accel(key='Backspace', mod1='Command'))
         self.menu_edit.add_separator()
-        self.menu_edit.add_command(label='Mark Read', command=self.controller.mark_read, accelerator=sf.accel(key='R', mod1='Command'))
+        self.menu_edit.add_command(label='Mark Read', command=lambda: self.controller.mark_read(), accelerator=sf.accel(key='R', mod1='Command'))
         self.menubar.add_cascade(menu=self.menu_edit, label='Edit')
 
         # View menu
         self.menu_view = tk.Menu(self.menubar)
-        self.menu_view.add_command(label='Show Diff', command=self.controller.show_diff, accelerator=sf.accel(key='D', mod1='Command'))
-        self.menu_view.add_command(label='Open URL', command=self.controller.open_url, accelerator=sf.accel(key='U', mod1='Command'))
+        self.menu_view.add_command(label='Show Diff', command=lambda: self.controller.show_diff(), accelerator=sf.accel(key='D', mod1='Command'))
+        self.menu_view.add_command(label='Open URL', command=lambda: self.controller.open_url(), accelerator=sf.accel(key='U', mod1='Command'))
         self.menubar.add_cascade(menu=self.menu_view, label='View')
 
         self.configure(menu=self.menubar)
@@ -140,6 +140,9 @@ class MainWindow(tk.Toplevel):
 
     def load_file(self, path: str) -> None:
         """Create controller with file at 'path'"""
+        # Release the controller of the previously loaded file (none yet when called from '__init__')
+        if hasattr(self, 'controller'):
+            self.controller.close()
         try: 
             self.controller =  self._create_controller(path=path)
         # If controller raises exception, inform user and create a controller with in-memory DB (empty new file)
@@ -154,7 +157,8 @@ class MainWindow(tk.Toplevel):
             main_wdw=self,
             action_pane=self.action_pane,
             property_pane=self.property_pane,
-            list_pane=self.list_pane
+            list_pane=self.list_pane,
+            max_workers=self.parent.max_workers
         )
 
         return controller
@@ -223,9 +227,9 @@ class MainWindow(tk.Toplevel):
         # Don't do anything if clipboard is empty
         except tk.TclError:
             pass
-        # Otherwise paste
+        # Otherwise paste (one resource per whitespace-separated URL, e.g. a pasted list of URLs)
         else:
-            self.controller.new_resource(url=content)
+            self.controller.new_resources(urls=content.split())
 
     def _copy_url(self, even: tk.Event) -> None:
         """Copy the URLs of the selected resources to the system clipboard."""
@@ -233,8 +237,14 @@ class MainWindow(tk.Toplevel):
         if isinstance(even.widget, ttk.Entry):
             return
         
+        urls = self.controller.selected_urls()
+        # Keep clipboard as it is if there is nothing to copy
+        if not urls:
+            return
+
+        # One URL per line (can be pasted again as a list of URLs)
         self.clipboard_clear()
-        self.clipboard_append(self.controller.selected_urls())
+        self.clipboard_append('\n'.join(urls))
 
     def new(self) -> None:
         """Create a new and empty main window."""
@@ -243,5 +253,6 @@ class MainWindow(tk.Toplevel):
 
     def destroy(self, *args, **kwargs) -> None:
         """Destroy this main window and inform parent (root application) that it should be removed from list."""
+        self.controller.close()
         super().destroy(*args, **kwargs)
         self.parent.main_window_destroyed(main_window=self)
\ No newline at end of file
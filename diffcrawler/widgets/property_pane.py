@@ -24,7 +24,6 @@ class PropertyPane(ttk.Frame):
         self.columnconfigure(0, weight=1, minsize=200)
 
         # URL property        
-        self._url = ''
         self._url_ent_value = tk.StringVar()
         self._url_lbl = ttk.Label(self, text='URL')
         self._url_ent = ttk.Entry(self, textvariable=self._url_ent_value)
@@ -34,7 +33,6 @@ class PropertyPane(ttk.Frame):
         self._url_ent.bind('<Escape>', lambda _: self._reject_edit('url'))
 
         # Timeout property
-        self._timeout = ''
         self._timeout_ent_value = tk.StringVar()
         self._timeout_lbl = ttk.Label(self, text='Timeout (sec)')
         self._timeout_spbx = ttk.Spinbox(self, textvariable=self._timeout_ent_value, from_=1, to=9999, increment=1, command=lambda: self._validate_edit('timeout'))
@@ -44,7 +42,6 @@ class PropertyPane(ttk.Frame):
         self._timeout_spbx.bind('<Escape>', lambda _: self._reject_edit('timeout'))
         
         # Diff threshold property
-        self._diff_thresh = ''
         self._diff_thresh_ent_value = tk.StringVar()
         self._diff_thresh_lbl = ttk.Label(self, text='Diff Threshold')
         self._diff_thresh_spbx = ttk.Spinbox(self, textvariable=self._diff_thresh_ent_value, from_=1, to=9999, increment=1, command=lambda: self._validate_edit('diff_thresh'))
@@ -53,6 +50,16 @@ class PropertyPane(ttk.Frame):
         self._diff_thresh_spbx.bind('<Return>', lambda _: self._validate_edit('diff_thresh'))
         self._diff_thresh_spbx.bind('<Escape>', lambda _: self._reject_edit('diff_thresh'))
 
+        # Entry values and last accepted values (as strings) of the editable properties, by property name
+        self._fields = {
+            'url': self._url_ent_value,
+            'timeout': self._timeout_ent_value,
+            'diff_thresh': self._diff_thresh_ent_value
+        }
+        self._values = {'url': '', 'timeout': '', 'diff_thresh': ''}
+        # Conversion of accepted values to the type of the corresponding resource attribute
+        self._converters = {'url': str, 'timeout': int, 'diff_thresh': int}
+
         # Favorite property
         self._is_fav = tk.IntVar()
         self._fav_box = ttk.Checkbutton(self, text='Favorite', variable=self._is_fav, command=lambda : self._property_changed('is_fav'))
@@ -86,11 +93,11 @@ class PropertyPane(ttk.Frame):
         """Show the properties of the passed resource."""
         # Single item selection mode -> show all property fields
         if len(resources) == 1:
-            self._url = resources[0].url if resources[0].url is not None else ''
-            self._url_ent_value.set(self._url)
-            self._timeout = str(resources[0].timeout)
+            self._values['url'] = resources[0].url if resources[0].url is not None else ''
+            self._url_ent_value.set(self._values['url'])
+            self._values['timeout'] = str(resources[0].timeout)
             self._timeout_ent_value.set(resources[0].timeout)
-            self._diff_thresh = str(resources[0].diff_thresh)
+            self._values['diff_thresh'] = str(resources[0].diff_thresh)
             self._diff_thresh_ent_value.set(resources[0].diff_thresh)
             self._is_fav.set(1 if resources[0].is_fav else 0)
             date_string = format_date(resources[0].added_date)
@@ -101,9 +108,9 @@ class PropertyPane(ttk.Frame):
             self._show_fields(hidden=True)
         # Multiple item selection mode -> only timeout, diff-threshold and favorite-state changeable
         else:
-            self._timeout = ''
+            self._values['timeout'] = ''
             self._timeout_ent_value.set('')
-            self._diff_thresh = ''
+            self._values['diff_thresh'] = ''
             self._diff_thresh_ent_value.set('')
             self._is_fav.set(0)
             self._url_lbl.grid_remove()
@@ -116,6 +123,11 @@ class PropertyPane(ttk.Frame):
         edit_valid = False
 
         if property == 'url':
+            # Unchanged URL, nothing to validate or pass on to the controller (focus-out events fire repeatedly,
+            # e.g. while changing the selection)
+            if self._url_ent_value.get() == self._values['url']:
+                self._reject_edit(property)
+                return
             valid_url = is_valid_url(self._url_ent_value.get())
             # Entry must be valid URL or nothing AND entry field must be on grid (single item selection).
             # For multiple item selection with shift or cmd after single selection, the entry field does not lose focus
@@ -125,7 +137,7 @@ class PropertyPane(ttk.Frame):
             edit_valid = (self._url_ent_value.get() == '' or valid_url) and self._url_ent.grid_info()
         elif property == 'timeout' or property == 'diff_thresh':
             try:
-                int_val = int(getattr(self, f'_{property}_ent_value').get())
+                int_val = int(self._fields[property].get())
             except ValueError:
                 edit_valid = False
             else:
@@ -138,27 +150,23 @@ class PropertyPane(ttk.Frame):
     
     def _accept_edit(self, property: str) -> None:
         """"Accept and set the new property value."""
-        setattr(self, f'_{property}', getattr(self, f'_{property}_ent_value').get())
+        self._values[property] = self._fields[property].get()
         self._property_changed(property)
         # Make field lose focus
         self.focus_set()
     
     def _reject_edit(self, property: str) -> None:
         """Reject the new property value and revert field to 'old' value."""
-        getattr(self, f'_{property}_ent_value').set(getattr(self, f'_{property}'))
+        self._fields[property].set(self._values[property])
         # Make field lose focus
         self.focus_set()
 
     def _property_changed(self, property: str) -> None:
         """Inform controller about property change and pass the correctly formatted new value."""
-        if property == 'url':
-            new_value = self._url
-        elif property == 'timeout':
-            new_value = int(self._timeout)
-        elif property == 'diff_thresh':
-            new_value = int(self._diff_thresh)
-        elif property == 'is_fav':
+        if property == 'is_fav':
             new_value = True if self._is_fav.get() == 1 else False
+        else:
+            new_value = self._converters[property](self._values[property])
         
         self.controller.property_changed(property, new_value)
 
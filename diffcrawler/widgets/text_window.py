@@ -2,6 +2,7 @@
 Window used to display a string in a textbox.
 """
 
+from typing import Callable
 import tkinter as tk
 import tkinter.ttk as ttk
 
@@ -13,16 +14,20 @@ class TextWindow(tk.Toplevel):
     Toplevel window containing only a scrollable textbox. Used to display (possibly long) strings/text.
     """
 
-    def __init__(self, parent: tk.Tk, text: str = '', title: str = '', *args, **kwargs) -> None:
+    def __init__(self, parent: tk.Tk, text: str = '', title: str = '', on_close: Callable | None = None, *args, **kwargs) -> None:
         super().__init__(parent, *args, **kwargs)
 
+        # If set, window is hidden (for reuse) instead of destroyed on close and this is called with the window
+        self._on_close = on_close
+
         self.rowconfigure(0, weight=1)
         self.columnconfigure(0, weight=1)
         self.minsize(300, 300)
         self.title(title)
 
 
-        self._txt_wdgt = tk.Text(self, width=300, height=300, wrap='none')
+        # Size is left to the grid layout, no undo stack needed for read-only text
+        self._txt_wdgt = tk.Text(self, wrap='none', undo=False)
         self._txt_wdgt.insert('1.0', text)
         # Disable possibility to edit displayed text
         self._txt_wdgt.configure(state='disabled')
@@ -36,6 +41,26 @@ class TextWindow(tk.Toplevel):
         self._txt_wdgt.configure(xscrollcommand=self._hsb.set)
 
         # Allow closing window with shortcuts
-        sf = ShortcutFormatter(ws=self.tk.call('tk', 'windowingsystem'))
-        self.bind(sf.binding(key='w', mod1='Command'), lambda _: self.destroy())
-        self.bind('<Escape>', lambda _: self.destroy())
\ No newline at end of file
+        sf = ShortcutFormatter.for_widget(self)
+        self.bind(sf.binding(key='w', mod1='Command'), lambda _: self.close())
+        self.bind('<Escape>', lambda _: self.close())
+        self.protocol('WM_DELETE_WINDOW', self.close)
+
+    def set_text(self, text: str, title: str = '') -> None:
+        """Replace the displayed text and the window title."""
+        self.title(title)
+        self._txt_wdgt.configure(state='normal')
+        self._txt_wdgt.delete('1.0', 'end')
+        self._txt_wdgt.insert('1.0', text)
+        self._txt_wdgt.configure(state='disabled')
+
+    def close(self) -> None:
+        """Close the window: hide it for reuse if a close handler is set, otherwise destroy it."""
+        if self._on_close is None:
+            self.destroy()
+            return
+
+        self.withdraw()
+        # Don't keep (possibly long) text of hidden window in memory
+        self.set_text('')
+        self._on_close(self)
\ No newline at end of file